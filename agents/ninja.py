@@ -20,18 +20,7 @@ class NinjaGoshi(Goshi):
         :param goban: The current observation of the game.
         :return: The next move as a (row, col) tuple.
         """
-        # Finds all the empty positions in the observation
-        empty_positions = [
-            Ten(row, col)
-            for row in range(len(goban.ban))
-            for col in range(len(goban.ban[row]))
-            if goban.ban[row][col] is None
-        ]
-
-        # Chooses a random valid empty position
-        random.shuffle(empty_positions)
-        for ten in empty_positions:
-            if goban.ban[ten.row][ten.col] is None:
-                return ten
-        else:
+        # Chooses a random empty position
+        if not goban.empties:
             return None
+        return goban.ten(random.choice(tuple(goban.empties)))
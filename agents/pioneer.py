@@ -16,8 +16,9 @@ class Pioneer(Goshi):
         :param goban: The current observation of the game.
         :return: The next move as a (row, col) tuple.
         """
-        for row in range(len(goban.ban)):
-            for col in range(len(goban.ban[row])):
-                if goban.ban[row][col] is None:
-                    return Ten(row, col)
-        return None
+        empty = goban.empty
+        if not empty:
+            return None
+        # The lowest set bit of the empty bitboard
+        pos = (empty & -empty).bit_length() - 1
+        return goban.ten(pos)
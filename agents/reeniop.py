@@ -16,8 +16,9 @@ class Reeniop(Goshi):
         :param goban: The current observation of the game.
         :return: The next move as a (row, col) tuple.
         """
-        for row in range(goban.size - 1, -1, -1):
-            for col in range(goban.size - 1, -1, -1):
-                if goban.ban[row][col] is None:
-                    return Ten(row, col)
-        return None
+        empty = goban.empty
+        if not empty:
+            return None
+        # The highest set bit of the empty bitboard
+        pos = empty.bit_length() - 1
+        return goban.ten(pos)
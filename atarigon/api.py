@@ -16,7 +16,10 @@ ends when all the players pass.
 """
 
 import abc
-from typing import List, Optional, Set, NamedTuple
+import random
+from array import array
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, NamedTuple, Tuple
 
 from atarigon.exceptions import (
     NotEnoughPlayersError,
@@ -62,6 +65,21 @@ class Goshi(metaclass=abc.ABCMeta):
         return self.name
 
 
+@lru_cache(maxsize=None)
+def _zobrist_table(size: int, players: int) -> List[int]:
+    """The Zobrist keys for a board and a number of players.
+
+    The keys are generated with a fixed seed, so the same board and
+    number of players always get the same table.
+
+    :param size: The size of the board (size x size).
+    :param players: The number of players in the game.
+    :return: A key for each pair of player and intersection.
+    """
+    rng = random.Random(0)
+    return [rng.getrandbits(64) for _ in range(size * size * players)]
+
+
 class Goban:
     """Represents a variable-size Go board 碁盤 (Goban)."""
 
@@ -82,10 +100,111 @@ class Goban:
         self.size = size
 
         self.stone_colors = {p: str(i) for i, p in enumerate(goshi, 1)}
-        self.ban: List[List[Optional[Goshi]]] = [
-            [None for _ in range(size)]
-            for _ in range(size)
-        ]
+
+        # The board is stored as bitboards, where the intersection at
+        # (row, col) is the bit row * size + col: one with the empty
+        # intersections and one for the stones of each player
+        self._board_mask = (1 << size * size) - 1
+        self.empty = self._board_mask
+        self.occ: Dict[Goshi, int] = {p: 0 for p in goshi}
+        # The empty intersections also as a set of indices, to enumerate
+        # them without walking the bits of the bitboard
+        self.empties: Set[int] = set(range(size * size))
+        # And as a contiguous array with the index of the player in each
+        # intersection (starting at 1), or 0 if it's empty. Its items are
+        # unsigned ints, not bytes, so there can be more than 255 players
+        self.cells = array('I', [0]) * (size * size)
+        self.idx: Dict[Goshi, int] = {p: i for i, p in enumerate(goshi, 1)}
+        self._players: List[Optional[Goshi]] = [None, *goshi]
+        self._ban: Optional[Tuple[Tuple[Optional[Goshi], ...], ...]] = None
+
+        # The bitmask with the neighbourhood of each intersection
+        self.nmask = [0] * (size * size)
+        for row in range(size):
+            for col in range(size):
+                ten = Ten(row, col)
+                for betsu_no_ten in (ten + shihō for shihō in Goban.SHIHŌ):
+                    if self.goban_no_naka(betsu_no_ten):
+                        self.nmask[self.pos(ten)] |= 1 << self.pos(betsu_no_ten)
+
+        # Masks with every column but the first and every column but the
+        # last one, so shifting a bitboard left or right doesn't wrap
+        # stones around the edges of the board (shifting by a whole row
+        # is kept inside the board with _board_mask)
+        self._no_first_col = sum(
+            1 << pos for pos in range(size * size) if pos % size
+        )
+        self._no_last_col = self._no_first_col >> 1
+
+        # The groups of stones as a union-find, where each stone points
+        # to its parent and the root of each group keeps its ledges: the
+        # number of (stone, empty neighbour) pairs in the group, so the
+        # group has no liberties when they reach zero
+        self.parent: Dict[int, int] = {}
+        self.ledges: Dict[int, int] = {}
+
+        # Zobrist hashing: a random key for each player and intersection,
+        # so the hash of the position is updated with a XOR whenever a
+        # stone is placed or removed
+        self.zob = _zobrist_table(size, len(goshi))
+        self._zob_base = {p: i * size * size for i, p in enumerate(goshi)}
+        self.hash = 0
+
+    @property
+    def ban(self) -> Tuple[Tuple[Optional[Goshi], ...], ...]:
+        """The board as a matrix with the player in each intersection.
+
+        It is a read-only view: the rows are tuples and the property
+        can't be assigned, since writing to it wouldn't change the board
+        anyway. It is built from `cells` the first time it's accessed
+        after a change in the board, so prefer `cells` or the bitboards
+        when speed matters.
+
+        :return: A size x size matrix where each intersection holds the
+            player with a stone in it, or None if it is empty.
+        """
+        if self._ban is None:
+            self._ban = tuple(
+                tuple(self._players[i] for i in self.cells[r:r + self.size])
+                for r in range(0, self.size * self.size, self.size)
+            )
+        return self._ban
+
+    def pos(self, ten: Ten) -> int:
+        """The index of the bit for the given intersection.
+
+        :param ten: The intersection.
+        :return: The index of its bit in the bitboards.
+        :raises InvalidMoveError: If the intersection is off the board.
+        """
+        if not self.goban_no_naka(ten):
+            raise InvalidMoveError(ten)
+        return ten.row * self.size + ten.col
+
+    def ten(self, pos: int) -> Ten:
+        """The intersection for the given index of the bitboards.
+
+        :param pos: The index of the bit in the bitboards.
+        :return: The intersection it represents.
+        """
+        return Ten(*divmod(pos, self.size))
+
+    def ishi(self, ten: Ten) -> Optional[Goshi]:
+        """The owner of the stone (石, ishi) at the given intersection.
+
+        :param ten: The intersection to check.
+        :return: The player with a stone there, or None if it's empty.
+        :raises InvalidMoveError: If the intersection is off the board.
+        """
+        return self._ishi(self.pos(ten))
+
+    def _ishi(self, pos: int) -> Optional[Goshi]:
+        """The owner of the stone at the given index of the bitboards.
+
+        :param pos: The index of the intersection in the bitboards.
+        :return: The player with a stone there, or None if it's empty.
+        """
+        return self._players[self.cells[pos]]
 
     def place_stone(self, ten: Ten, goshi: Goshi) -> Set[Goshi]:
         """Places a stone on the board.
@@ -94,23 +213,52 @@ class Goban:
         :param goshi: A set with the players that were captured. If no
             players were captured, the set is empty.
         """
-        if not self.goban_no_naka(ten):
-            raise InvalidMoveError(ten)
-        row, col = ten
-        if self.ban[row][col] is not None:
+        pos = self.pos(ten)
+        mask = 1 << pos
+        if not self.empty & mask:
             raise HikūtenError(ten)
 
-        self.ban[row][col] = goshi
-        captured = self.check_captures(ten, goshi)
-        for captured_goshi in captured:
-            # Remove all the stones of the captured players from the
-            # board
-            for r, row in enumerate(self.ban):
-                for c, goshi_in_ten in enumerate(row):
-                    if goshi_in_ten == captured_goshi:
-                        self.ban[r][c] = None
-
-        return captured
+        self.occ[goshi] |= mask
+        self.empty &= ~mask
+        self.empties.discard(pos)
+        self.cells[pos] = self.idx[goshi]
+        self.hash ^= self.zob[self._zob_base[goshi] + pos]
+        self._ban = None
+
+        # The new stone is the root of its group, joining the groups of
+        # the same player around it. Every neighbour stone loses the
+        # ledge it had with this intersection
+        self.parent[pos] = pos
+        self.ledges[pos] = (self.nmask[pos] & self.empty).bit_count()
+        stones = self.occ[goshi]
+        m = self.nmask[pos] & ~self.empty
+        while m:
+            nb = (m & -m).bit_length() - 1
+            m &= m - 1
+            root = self.find(nb)
+            if stones >> nb & 1:
+                if root != pos:
+                    self.ledges[pos] += self.ledges.pop(root)
+                    self.parent[root] = pos
+                root = pos
+            self.ledges[root] -= 1
+
+        # The captured players are taken out of the board while checking
+        return self.check_captures(ten, goshi)
+
+    def find(self, pos: int) -> int:
+        """The root of the group of the stone at the given position.
+
+        :param pos: The index of the stone in the bitboards.
+        :return: The index of the root stone of its group.
+        """
+        parent = self.parent
+        while parent[pos] != pos:
+            # Path halving: each stone on the way ends up pointing to its
+            # grandparent, so the next searches are shorter
+            parent[pos] = parent[parent[pos]]
+            pos = parent[pos]
+        return pos
 
     def shūi(self, ten: Ten) -> List[Ten]:
         """The neighbourhood (shūi, 周囲) of a given intersecion.
@@ -124,6 +272,14 @@ class Goban:
             if self.goban_no_naka(ten)
         ]
 
+    def neighbours_bits(self, pos: int) -> int:
+        """The neighbourhood of a given intersection as a bitmask.
+
+        :param pos: The index of the intersection in the bitboards.
+        :return: A bitmask with the intersections of the neighbourhood.
+        """
+        return self.nmask[pos]
+
     def check_captures(self, ten: Ten, goshi: Goshi) -> Set[Goshi]:
         """Checks whether the group at the given position has liberties.
 
@@ -133,20 +289,40 @@ class Goban:
             were captured, the set is empty.
         """
         captured = set()
-        for betsu_no_ten in self.shūi(ten):
-            taisen_aite = self.ban[betsu_no_ten.row][betsu_no_ten.col]
-            if taisen_aite is None:
+        checked_roots = set()
+        ours = self.idx[goshi]
+        pos = self.pos(ten)
+        # Capturing a player may give liberties to the next neighbours,
+        # so they're checked in the same order as SHIHŌ: first the ones
+        # after the intersection (right, down) from the lowest bit and
+        # then the ones before it (left, up) from the highest bit
+        after = self.nmask[pos] >> pos << pos
+        before = self.nmask[pos] ^ after
+        while after or before:
+            if after:
+                nb = (after & -after).bit_length() - 1
+                after &= after - 1
+            else:
+                nb = before.bit_length() - 1
+                before ^= 1 << nb
+            if self.cells[nb] == 0:
                 # If the neighbor is empty, we don't capture anything
                 continue
-            if taisen_aite == goshi:
+            if self.cells[nb] == ours:
                 # If the neighbor is us, we don't capture anything
                 continue
-            if self.kokyū_ten(betsu_no_ten):
+            root = self.find(nb)
+            if root in checked_roots:
+                # The group of the neighbour was already checked
+                continue
+            checked_roots.add(root)
+            if self.ledges[root]:
                 # The neighbor has liberties, we don't capture it
                 continue
 
             # The neighbour has no liberties, so we capture it
-            self.toru(betsu_no_ten)
+            taisen_aite = self._ishi(nb)
+            self.toru(taisen_aite)
             captured.add(taisen_aite)
         return captured
 
@@ -156,51 +332,95 @@ class Goban:
         :param ten: The position to check.
         :return: A list with the liberties of the group.
         :raises KūtenError: If the intersection is empty.
+        :raises InvalidMoveError: If the intersection is off the board.
         """
-        goshi = self.ban[ten.row][ten.col]
+        goshi = self.ishi(ten)
         if goshi is None:
             raise KūtenError(ten)
 
-        stack = [ten]
-        visited = set()
         kokyū_ten = set()
-        while stack:
-            ten = stack.pop()
-            if ten in visited:
-                # Intersection already visited, so we skip it
-                continue
-            else:
-                visited.add(ten)
-
-            for betsu_no_ten in self.shūi(ten):
-                taisen_aite = self.ban[betsu_no_ten.row][betsu_no_ten.col]
-                if taisen_aite is None:
-                    # Empty intersection in the neighbourhood, so we add it
-                    kokyū_ten.add(betsu_no_ten)
-                elif taisen_aite == goshi:
-                    # Our stone in the neighbourhood; we add it to the stack
-                    stack.append(betsu_no_ten)
-
+        m = self._kokyū(self.pos(ten), goshi)
+        while m:
+            kokyū_ten.add(self.ten((m & -m).bit_length() - 1))
+            m &= m - 1
         return kokyū_ten
 
-    def toru(self, ten: Ten):
-        """Captures (取る toru) the group at the given position.
+    def kokyū_count(self, ten: Ten) -> int:
+        """Number of liberties of the group at the given position.
 
-        Inthe end, that means removing all the stones of the group from
-        the board, so we simply set all the intersections of the player
-        to None.
+        Like `kokyū_ten`, but without building the set of liberties.
 
         :param ten: The position to check.
-        :raises HikūtenError: If the intersection is empty.
+        :return: The number of liberties of the group.
+        :raises KūtenError: If the intersection is empty.
+        :raises InvalidMoveError: If the intersection is off the board.
         """
-        goshi = self.ban[ten.row][ten.col]
+        goshi = self.ishi(ten)
         if goshi is None:
-            raise HikūtenError(ten)
+            raise KūtenError(ten)
+
+        return self._kokyū(self.pos(ten), goshi).bit_count()
 
-        for r, row in enumerate(self.ban):
-            for c, goshi_in_ten in enumerate(row):
-                if goshi_in_ten == goshi:
-                    self.ban[r][c] = None
+    def _kokyū(self, pos: int, goshi: Goshi) -> int:
+        """Liberties of the group of the player as a bitboard.
+
+        :param pos: The index of a stone of the group.
+        :param goshi: The owner of the group.
+        :return: The bitboard with the liberties of the group.
+        """
+        stones = self.occ[goshi]
+        # The group grows one ring of neighbours at a time, but only
+        # over our stones, until it doesn't grow anymore
+        group = 1 << pos
+        while True:
+            grown = self._dilate(group) & stones
+            if grown == group:
+                break
+            group = grown
+
+        return self._dilate(group) & self.empty
+
+    def _dilate(self, bits: int) -> int:
+        """The given intersections plus all of their neighbours.
+
+        :param bits: The bitboard with the intersections.
+        :return: The bitboard with them and their neighbourhoods.
+        """
+        return (
+            bits
+            | bits << 1 & self._no_first_col
+            | bits >> 1 & self._no_last_col
+            | bits << self.size
+            | bits >> self.size
+        ) & self._board_mask
+
+    def toru(self, goshi: Goshi):
+        """Captures (取る toru) the given player.
+
+        In the end, that means removing all the stones of the player
+        from the board, so we simply move its whole bitboard back to the
+        empty one.
+
+        :param goshi: The captured player.
+        """
+        stones = self.occ[goshi]
+        self.empty |= stones
+        self.occ[goshi] = 0
+        self._ban = None
+
+        # Each stone around the freed intersections gains a ledge
+        while stones:
+            pos = (stones & -stones).bit_length() - 1
+            stones &= stones - 1
+            self.empties.add(pos)
+            self.cells[pos] = 0
+            self.hash ^= self.zob[self._zob_base[goshi] + pos]
+            del self.parent[pos]
+            self.ledges.pop(pos, None)
+            m = self.nmask[pos] & ~self.empty
+            while m:
+                self.ledges[self.find((m & -m).bit_length() - 1)] += 1
+                m &= m - 1
 
     def seichō(self, ten: Ten, goshi: Goshi) -> bool:
         """If a move is legal (正着, seichō) or not (不味い, fumuji).
@@ -212,7 +432,7 @@ class Goban:
         """
         if self.goban_no_naka(ten):
             # Is valid if it's empty and it's not an auto-suicide move
-            is_empty = self.ban[ten.row][ten.col] is None
+            is_empty = bool(self.empty >> self.pos(ten) & 1)
             is_suicide = self.jishi(ten, goshi)
             return is_empty and not is_suicide
         else:
@@ -234,25 +454,38 @@ class Goban:
         :return: True if the movement results in an autosuicide, False
             otherwise.
         :raises HiHikūtenError: If the positions is not empty.
+        :raises InvalidMoveError: If the intersection is off the board.
         """
-        if self.ban[ten.row][ten.col] is not None:
+        pos = self.pos(ten)
+        if not self.empty >> pos & 1:
             raise HikūtenError(ten)
 
-        # We put the stone and see the number of liberties for the
-        # resulting group
-        self.ban[ten.row][ten.col] = goshi
-        kokyū_ten = self.kokyū_ten(ten)
+        if self.nmask[pos] & self.empty:
+            # An empty neighbour is already a liberty for the stone. It's
+            # the case for most of the moves, so we answer right away
+            return False
 
-        # And of course, we return to the previous state
-        self.ban[ten.row][ten.col] = None
+        # The ledges of the resulting group are the ones of the groups
+        # it would join, but each of our neighbour stones loses the
+        # ledge with this intersection
+        ledges = 0
+        roots = set()
+        friends = self.nmask[pos] & self.occ[goshi]
+        while friends:
+            root = self.find((friends & -friends).bit_length() - 1)
+            friends &= friends - 1
+            if root not in roots:
+                roots.add(root)
+                ledges += self.ledges[root]
+            ledges -= 1
 
         # If the group has no liberties, is an auto-suicide move
-        return len(kokyū_ten) == 0
+        return ledges == 0
 
     def print_board(self):
         """Prints the board to the console."""
-        for row in self.ban:
+        colors = ['.'] + [self.stone_colors[p] for p in self._players[1:]]
+        for r in range(0, self.size * self.size, self.size):
             print(' '.join([
-                '.' if p is None else self.stone_colors[p]
-                for p in row
+                colors[i] for i in self.cells[r:r + self.size]
             ]))
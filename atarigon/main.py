@@ -4,7 +4,9 @@ import inspect
 import os
 import random
 import sys
-from typing import Type, List
+from collections import deque
+from functools import lru_cache
+from typing import Type, List, Tuple
 
 from atarigon.api import Goshi, Goban
 
@@ -34,8 +36,13 @@ def run_game(
     kakunin = {g: 0 for g in goshi}  # The player's scores (確認)
     maketa = []  # The captured players (負けた)
     shoshinsha = []  # The players that doesn't know how to play (初心者)
-    while len(goshi) > 1:
-        player = goshi.pop(0)
+    active = set(goshi)  # The players still in the game
+    goshi = deque(goshi)  # The turns; it may hold already removed players
+    while len(active) > 1:
+        player = goshi.popleft()
+        if player not in active:
+            # It was captured while waiting for its turn
+            continue
         ten = player.decide(goban)
         if ten is None:
             # If the player passes, it's added to the end of the list
@@ -46,6 +53,7 @@ def run_game(
         # Ok, is a movement. If it is invalid, the player is
         # disqualified and the next player is called
         if not goban.seichō(ten, player):
+            active.discard(player)
             shoshinsha.append(player)
             continue
 
@@ -55,9 +63,9 @@ def run_game(
             # It maybe was an already captured player, so we check. If
             # not, the player score is incremented and the captured
             # player is removed from the game
-            if captured_player in goshi:
+            if captured_player in active:
                 kakunin[player] += 1
-                goshi.remove(captured_player)
+                active.discard(captured_player)
                 maketa.append(captured_player)
 
         # The player is added to the end of the list, waiting for its
@@ -66,7 +74,7 @@ def run_game(
 
     # Now we compute the scores based on the captured players and on
     # when and how they ended playing
-    for player in goshi:
+    for player in active:
         kakunin[player] += len(maketa) + len(shoshinsha)
     for i, player in enumerate(reversed(maketa)):
         kakunin[player] += i
@@ -79,16 +87,43 @@ def run_game(
 def find_subclasses(path: str, cls: Type[Goshi]):
     """Find all subclasses of a given class in a given path.
 
+    The modules are only loaded again if the files in the path changed
+    since the last call.
+
     :param path: The path to the directory where the modules are.
     :param cls: The class to find the subclasses of.
     :return: A list with all the subclasses of the given class in the
         given path.
     """
+    # The name and last modification time of each file in the path
+    mtimes = tuple(
+        (filename, os.path.getmtime(os.path.join(path, filename)))
+        for filename in sorted(os.listdir(path))
+    )
+    return list(_find_subclasses(path, cls, mtimes))
+
+
+@lru_cache(maxsize=None)
+def _find_subclasses(
+        path: str,
+        cls: Type[Goshi],
+        mtimes: Tuple[Tuple[str, float], ...],
+) -> Tuple[Type[Goshi], ...]:
+    """Loads the modules in a path and finds the subclasses in them.
+
+    :param path: The path to the directory where the modules are.
+    :param cls: The class to find the subclasses of.
+    :param mtimes: The name and modification time of each file in the
+        path, so the result is cached until any of them changes.
+    :return: A tuple with all the subclasses of the given class in the
+        given path.
+    """
     goshi_classes = []
 
-    sys.path.append(path)  # So we can import the modules from the path
+    if path not in sys.path:
+        sys.path.append(path)  # So we can import the modules from the path
 
-    for filename in os.listdir(path):
+    for filename, _ in mtimes:
         if filename.endswith('.py'):
             # Get the full module path name
             mod_name = filename[:-3]
@@ -104,7 +139,7 @@ def find_subclasses(path: str, cls: Type[Goshi]):
                 if inspect.isclass(o) and issubclass(o, cls) and o is not cls:
                     goshi_classes.append(o)
 
-    return goshi_classes
+    return tuple(goshi_classes)
 
 
 def main():
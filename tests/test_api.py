@@ -0,0 +1,302 @@
+import random
+import unittest
+from typing import List, Optional, Set
+
+from atarigon.api import Goban, Goshi, Ten
+from atarigon.exceptions import InvalidMoveError
+
+
+class Dummy(Goshi):
+    """Player that never decides anything; the tests move for it."""
+
+    def decide(self, goban: Goban) -> Optional[Ten]:
+        return None
+
+
+def reference_liberties(
+        ban: List[List[Optional[Goshi]]], ten: Ten
+) -> Set[Ten]:
+    """Liberties of the group at the given position, flooding the board.
+
+    This is the plain matrix implementation the board used to have, and
+    it's used to check the incremental one.
+    """
+    size = len(ban)
+    goshi = ban[ten.row][ten.col]
+    stack, visited, liberties = [ten], set(), set()
+    while stack:
+        ten = stack.pop()
+        if ten in visited:
+            continue
+        visited.add(ten)
+        for shihō in Goban.SHIHŌ:
+            nb = ten + shihō
+            if not (0 <= nb.row < size and 0 <= nb.col < size):
+                continue
+            if ban[nb.row][nb.col] is None:
+                liberties.add(nb)
+            elif ban[nb.row][nb.col] is goshi:
+                stack.append(nb)
+    return liberties
+
+
+def reference_place(
+        ban: List[List[Optional[Goshi]]], ten: Ten, goshi: Goshi
+) -> Set[Goshi]:
+    """Places a stone in the matrix and removes the captured players."""
+    size = len(ban)
+    ban[ten.row][ten.col] = goshi
+    captured = set()
+    for shihō in Goban.SHIHŌ:
+        nb = ten + shihō
+        if not (0 <= nb.row < size and 0 <= nb.col < size):
+            continue
+        taisen_aite = ban[nb.row][nb.col]
+        if taisen_aite is None or taisen_aite is goshi:
+            continue
+        if reference_liberties(ban, nb):
+            continue
+        for row in ban:
+            for col, p in enumerate(row):
+                if p is taisen_aite:
+                    row[col] = None
+        captured.add(taisen_aite)
+    return captured
+
+
+def reference_legal(
+        ban: List[List[Optional[Goshi]]], ten: Ten, goshi: Goshi
+) -> bool:
+    """If the stone would have liberties, without checking captures."""
+    ban[ten.row][ten.col] = goshi
+    legal = bool(reference_liberties(ban, ten))
+    ban[ten.row][ten.col] = None
+    return legal
+
+
+class TestCaptures(unittest.TestCase):
+
+    def setUp(self):
+        self.a, self.b, self.c = Dummy('A'), Dummy('B'), Dummy('C')
+        self.goban = Goban(size=2, goshi=[self.a, self.b, self.c])
+
+    def test_capture_frees_next_neighbour_in_shihō_order(self):
+        # B on the right of (0, 0) is checked before C below it, and
+        # taking B gives C a liberty at (1, 1)
+        self.goban.place_stone(Ten(0, 1), self.b)
+        self.goban.place_stone(Ten(1, 0), self.c)
+        self.goban.place_stone(Ten(1, 1), self.b)
+
+        captured = self.goban.place_stone(Ten(0, 0), self.a)
+
+        self.assertEqual(captured, {self.b})
+        self.assertEqual(self.goban.ban, ((self.a, None), (self.c, None)))
+        self.assertEqual(self.goban.kokyū_ten(Ten(1, 0)), {Ten(1, 1)})
+
+    def test_capture_order_follows_shihō(self):
+        # Same position, but C on the right and B below it
+        self.goban.place_stone(Ten(0, 1), self.c)
+        self.goban.place_stone(Ten(1, 0), self.b)
+        self.goban.place_stone(Ten(1, 1), self.c)
+
+        captured = self.goban.place_stone(Ten(0, 0), self.a)
+
+        self.assertEqual(captured, {self.c})
+        self.assertEqual(self.goban.ban, ((self.a, None), (self.b, None)))
+
+    def test_suicide_that_would_capture_is_not_legal(self):
+        self.goban.place_stone(Ten(0, 1), self.b)
+        self.goban.place_stone(Ten(1, 0), self.c)
+        self.goban.place_stone(Ten(1, 1), self.b)
+
+        self.assertTrue(self.goban.jishi(Ten(0, 0), self.a))
+        self.assertFalse(self.goban.seichō(Ten(0, 0), self.a))
+
+
+class TestGroups(unittest.TestCase):
+
+    def setUp(self):
+        self.a, self.b = Dummy('A'), Dummy('B')
+        self.goban = Goban(size=3, goshi=[self.a, self.b])
+
+    def test_stone_merges_several_groups(self):
+        for ten in (Ten(0, 1), Ten(1, 0), Ten(1, 2), Ten(2, 1)):
+            self.goban.place_stone(ten, self.a)
+
+        self.goban.place_stone(Ten(1, 1), self.a)
+
+        roots = {
+            self.goban.find(self.goban.pos(ten))
+            for ten in (Ten(0, 1), Ten(1, 0), Ten(1, 1), Ten(1, 2), Ten(2, 1))
+        }
+        self.assertEqual(len(roots), 1)
+        # Each corner is next to two stones of the group
+        self.assertEqual(self.goban.ledges[roots.pop()], 8)
+        self.assertEqual(self.goban.kokyū_count(Ten(1, 1)), 4)
+
+    def test_group_is_captured_when_its_ledges_reach_zero(self):
+        self.goban.place_stone(Ten(0, 0), self.a)
+        self.goban.place_stone(Ten(0, 1), self.a)
+        self.goban.place_stone(Ten(1, 0), self.b)
+        self.assertEqual(
+            self.goban.place_stone(Ten(1, 1), self.b), set()
+        )
+        self.assertEqual(self.goban.kokyū_ten(Ten(0, 0)), {Ten(0, 2)})
+
+        captured = self.goban.place_stone(Ten(0, 2), self.b)
+
+        self.assertEqual(captured, {self.a})
+        self.assertEqual(self.goban.occ[self.a], 0)
+        self.assertEqual(self.goban.kokyū_count(Ten(1, 0)), 5)
+        self.assertEqual(
+            self.goban.ledges[self.goban.find(self.goban.pos(Ten(1, 0)))],
+            5,
+        )
+
+
+class TestZobrist(unittest.TestCase):
+
+    def setUp(self):
+        self.a, self.b = Dummy('A'), Dummy('B')
+        self.goban = Goban(size=3, goshi=[self.a, self.b])
+
+    def test_hash_depends_only_on_the_position(self):
+        self.assertEqual(self.goban.hash, 0)
+        self.goban.place_stone(Ten(0, 0), self.a)
+        self.assertNotEqual(self.goban.hash, 0)
+
+        other = Goban(size=3, goshi=[self.a, self.b])
+        other.place_stone(Ten(0, 0), self.b)
+        self.assertNotEqual(other.hash, self.goban.hash)
+
+    def test_hash_is_restored_after_a_capture(self):
+        self.goban.place_stone(Ten(1, 0), self.b)
+        self.goban.place_stone(Ten(1, 1), self.b)
+        before = self.goban.hash
+
+        self.goban.place_stone(Ten(0, 0), self.a)
+        self.goban.place_stone(Ten(0, 1), self.a)
+        self.assertNotEqual(self.goban.hash, before)
+        # Taking A leaves the board as it was before A played, plus the
+        # capturing stone
+        self.assertEqual(
+            self.goban.place_stone(Ten(0, 2), self.b), {self.a}
+        )
+
+        expected = Goban(size=3, goshi=[self.a, self.b])
+        for ten in (Ten(1, 0), Ten(1, 1), Ten(0, 2)):
+            expected.place_stone(ten, self.b)
+        self.assertEqual(self.goban.hash, expected.hash)
+        self.goban.toru(self.b)
+        self.assertEqual(self.goban.hash, 0)
+
+
+class TestBan(unittest.TestCase):
+
+    def setUp(self):
+        self.a, self.b = Dummy('A'), Dummy('B')
+        self.goban = Goban(size=3, goshi=[self.a, self.b])
+
+    def test_ban_is_read_only(self):
+        self.goban.place_stone(Ten(0, 0), self.a)
+
+        with self.assertRaises(TypeError):
+            self.goban.ban[1][1] = self.b
+        with self.assertRaises(AttributeError):
+            self.goban.ban = None
+        self.assertIsNone(self.goban.ban[1][1])
+        self.assertTrue(self.goban.seichō(Ten(1, 1), self.a))
+
+    def test_ban_follows_the_board(self):
+        before = self.goban.ban
+        self.goban.place_stone(Ten(1, 1), self.b)
+
+        self.assertIsNone(before[1][1])
+        self.assertIs(self.goban.ban[1][1], self.b)
+
+
+class TestOffBoard(unittest.TestCase):
+
+    def setUp(self):
+        self.a, self.b = Dummy('A'), Dummy('B')
+        self.goban = Goban(size=3, goshi=[self.a, self.b])
+        self.goban.place_stone(Ten(1, 0), self.a)
+
+    def test_off_board_intersections_are_rejected(self):
+        for ten in (Ten(0, 3), Ten(0, -1), Ten(3, 0), Ten(-1, 0)):
+            with self.assertRaises(InvalidMoveError):
+                self.goban.pos(ten)
+            with self.assertRaises(InvalidMoveError):
+                self.goban.ishi(ten)
+            with self.assertRaises(InvalidMoveError):
+                self.goban.kokyū_ten(ten)
+            with self.assertRaises(InvalidMoveError):
+                self.goban.jishi(ten, self.a)
+            with self.assertRaises(InvalidMoveError):
+                self.goban.place_stone(ten, self.a)
+            self.assertFalse(self.goban.seichō(ten, self.a))
+
+
+class TestManyPlayers(unittest.TestCase):
+
+    def test_more_players_than_fit_in_a_byte(self):
+        goshi = [Dummy(str(i)) for i in range(300)]
+        goban = Goban(size=18, goshi=goshi)
+        for i, player in enumerate(goshi):
+            goban.place_stone(goban.ten(i), player)
+
+        self.assertIs(goban.ishi(goban.ten(299)), goshi[299])
+        self.assertIs(goban.ban[16][11], goshi[299])
+
+
+class TestRandomGames(unittest.TestCase):
+
+    def test_matches_reference_implementation(self):
+        for seed in range(60):
+            rng = random.Random(seed)
+            size = rng.randint(2, 7)
+            goshi = [Dummy(str(i)) for i in range(rng.randint(2, 4))]
+            if size ** 2 < len(goshi) + 1:
+                continue
+            goban = Goban(size=size, goshi=goshi)
+            ban = [[None] * size for _ in range(size)]
+            active = goshi.copy()
+            for _ in range(size ** 2 * 2):
+                if len(active) < 2:
+                    break
+                player = active.pop(0)
+                legal = []
+                for row in range(size):
+                    for col in range(size):
+                        ten = Ten(row, col)
+                        if ban[row][col] is not None:
+                            continue
+                        expected = reference_legal(ban, ten, player)
+                        self.assertEqual(
+                            goban.seichō(ten, player), expected,
+                            (seed, ten),
+                        )
+                        if expected:
+                            legal.append(ten)
+                active.append(player)
+                if not legal:
+                    continue
+
+                ten = rng.choice(legal)
+                captured = goban.place_stone(ten, player)
+                self.assertEqual(
+                    captured, reference_place(ban, ten, player), seed
+                )
+                self.assertEqual(goban.ban, tuple(map(tuple, ban)), seed)
+                for row in range(size):
+                    for col in range(size):
+                        if ban[row][col] is not None:
+                            self.assertEqual(
+                                goban.kokyū_ten(Ten(row, col)),
+                                reference_liberties(ban, Ten(row, col)),
+                            )
+                active = [p for p in active if p not in captured]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import os
+import tempfile
+import unittest
+from typing import List, Optional
+
+from atarigon.api import Goban, Goshi, Ten
+from atarigon.main import find_subclasses, run_game
+
+AGENT_TEMPLATE = '''from atarigon.api import Goshi
+
+
+class {name}(Goshi):
+    def __init__(self):
+        super().__init__('{name}')
+
+    def decide(self, goban):
+        return None
+'''
+
+
+class Scripted(Goshi):
+    """Player that plays a fixed list of moves, and then passes."""
+
+    def __init__(self, name: str, moves: List[Optional[Ten]]):
+        super().__init__(name)
+        self.moves = list(moves)
+
+    def decide(self, goban: Goban) -> Optional[Ten]:
+        return self.moves.pop(0) if self.moves else None
+
+
+class TestRunGame(unittest.TestCase):
+
+    def test_scores_with_passes_disqualifications_and_captures(self):
+        # On a 3x3 board, A surrounds B at (0, 0) and C at (0, 2) and
+        # takes both with a single stone at (0, 1). D and E pass and then
+        # play off the board, so they're disqualified
+        off_board = Ten(9, 9)
+        a = Scripted('A', [Ten(1, 0), Ten(1, 2), Ten(0, 1)])
+        b = Scripted('B', [Ten(0, 0), None])
+        c = Scripted('C', [Ten(0, 2), None])
+        d = Scripted('D', [None, off_board])
+        e = Scripted('E', [None, None, off_board])
+        goshi = [a, b, c, d, e]
+
+        scores = run_game(
+            goban=Goban(size=3, goshi=goshi),
+            goshi=goshi,
+            shuffle=False,
+        )
+
+        # A gets one point per capture plus one per player out of the
+        # game (two captured and two disqualified)
+        self.assertEqual(scores[a], 6)
+        # The captured players get their position in the order they were
+        # captured, and both were captured by the same move
+        self.assertEqual(sorted([scores[b], scores[c]]), [0, 1])
+        self.assertEqual(scores[d], 0)
+        self.assertEqual(scores[e], 0)
+        # E played after B and C were captured, so they were skipped
+        self.assertEqual(b.moves, [])
+        self.assertEqual(c.moves, [])
+        self.assertEqual(e.moves, [])
+
+    def test_original_list_is_not_modified(self):
+        a = Scripted('A', [Ten(0, 0)])
+        b = Scripted('B', [Ten(5, 5)])
+        goshi = [a, b]
+
+        scores = run_game(
+            goban=Goban(size=2, goshi=goshi),
+            goshi=goshi,
+            shuffle=False,
+        )
+
+        self.assertEqual(goshi, [a, b])
+        self.assertEqual(scores, {a: 1, b: 0})
+
+
+class TestFindSubclasses(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = self.tmp.name
+        self.mtime = 1_000_000_000
+        self.write('zeta', 'Zeta')
+        self.write('alpha', 'Alpha')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, filename: str, name: str):
+        """Writes an agent module with a fresh modification time."""
+        path = os.path.join(self.path, f'{filename}.py')
+        with open(path, 'w') as f:
+            f.write(AGENT_TEMPLATE.format(name=name))
+        self.mtime += 10
+        os.utime(path, (self.mtime, self.mtime))
+
+    def names(self) -> List[str]:
+        return [c.__name__ for c in find_subclasses(self.path, Goshi)]
+
+    def test_classes_are_returned_in_file_name_order(self):
+        self.assertEqual(self.names(), ['Alpha', 'Zeta'])
+
+    def test_modules_are_not_loaded_again_if_nothing_changed(self):
+        first = find_subclasses(self.path, Goshi)
+        second = find_subclasses(self.path, Goshi)
+
+        # Loading a module again would create new classes
+        self.assertEqual(len(first), 2)
+        for old, new in zip(first, second):
+            self.assertIs(old, new)
+        # and the returned list is a copy
+        second.clear()
+        self.assertEqual(len(find_subclasses(self.path, Goshi)), 2)
+
+    def test_modified_file_is_loaded_again(self):
+        first = find_subclasses(self.path, Goshi)
+        path = os.path.join(self.path, 'alpha.py')
+        os.utime(path, (self.mtime + 10, self.mtime + 10))
+
+        second = find_subclasses(self.path, Goshi)
+
+        self.assertEqual([c.__name__ for c in second], ['Alpha', 'Zeta'])
+        self.assertIsNot(first[0], second[0])
+
+    def test_added_and_removed_files_are_noticed(self):
+        self.assertEqual(self.names(), ['Alpha', 'Zeta'])
+
+        self.write('beta', 'Beta')
+        self.assertEqual(self.names(), ['Alpha', 'Beta', 'Zeta'])
+
+        os.remove(os.path.join(self.path, 'zeta.py'))
+        self.assertEqual(self.names(), ['Alpha', 'Beta'])
+
+
+if __name__ == '__main__':
+    unittest.main()